@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 import os, sys
+# Opt in to SDL2's SIMD alpha blitter before pygame is imported.
+os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
 import pygame
 import chess
 import sqlite3
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 
 
 # -------------------- Config --------------------
@@ -48,36 +52,148 @@ DB_PATH = os.path.join(runtime_dir(), "results.db")
 
 # -------------------- Pygame init --------------------
 pygame.init()
-screen = pygame.display.set_mode((WIN_W, WIN_H))
+try:
+    # Double-buffered, v-synced display: flip becomes a buffer swap instead
+    # of a full-window copy. Fall back for drivers without vsync support.
+    screen = pygame.display.set_mode((WIN_W, WIN_H),
+                                     pygame.DOUBLEBUF | pygame.SCALED, vsync=1)
+except pygame.error:
+    screen = pygame.display.set_mode((WIN_W, WIN_H), pygame.DOUBLEBUF)
 pygame.display.set_caption("Chess – Dual Boards (engine + GUI)")
+# Stop unhandled event types at the SDL boundary — MOUSEMOTION in particular
+# arrives hundreds of times per second and would otherwise be queued, wrapped
+# and discarded.
+pygame.event.set_blocked([pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP,
+                          pygame.ACTIVEEVENT])
 title_font = pygame.font.SysFont(None, 30, bold=True)
 turn_font  = pygame.font.SysFont(None, 28, bold=True)
 banner_font = pygame.font.SysFont(None, 36, bold=True)
 check_font  = pygame.font.SysFont(None, 30, bold=True)
 coord_font  = pygame.font.SysFont(None, 16, bold=True)
+row_font    = pygame.font.SysFont(None, 22)   # scoreboard rows
+small_font  = pygame.font.SysFont(None, 20)   # scoreboard recent games
 COORD_COLOR = (200, 200, 200)
 
 LEFT_ANCHOR  = (PADDING, TOP_BANNER)
 RIGHT_ANCHOR = (PADDING + W_BOARD + GAP_BETWEEN, TOP_BANNER)
 
+# Frame pacing: full rate while redrawing; while idle the loop blocks on
+# pygame.event.wait (with a timeout so the process stays responsive) instead
+# of polling, so an idle app uses essentially no CPU.
+ACTIVE_FPS = 60
+IDLE_EVENT_TIMEOUT_MS = 500
+
+# Expose/restore events force a repaint because the dirty-flag loop repaints
+# nothing on its own: when the compositor does not preserve window contents,
+# an uncovered window stays stale until we repaint it.
+EXPOSE_EVENTS = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE)
+
+# Screen regions covered by the two boards, for partial display updates
+# when only board content (selection/dots) changed.
+BOARD_RECT_LEFT  = pygame.Rect(LEFT_ANCHOR,  (W_BOARD, H_BOARD))
+BOARD_RECT_RIGHT = pygame.Rect(RIGHT_ANCHOR, (W_BOARD, H_BOARD))
+
+# Banner strips above and below the boards, repainted together with the
+# boards after a move instead of flipping the whole window.
+BANNER_RECT_TOP    = pygame.Rect(0, 0, WIN_W, TOP_BANNER)
+BANNER_RECT_BOTTOM = pygame.Rect(0, TOP_BANNER + H_BOARD, WIN_W, BOTTOM_BANNER)
+
 # -------------------- Engine state --------------------
-board = chess.Board()
-selected_sq = None
-legal_targets = set()
-last_move = None
-game_over = False
-left_banner  = ""  # shows YOU WON / YOU LOST / DRAW
-right_banner = ""
-
-# Captured pieces tracking
-captured_white = []  # White pieces that got captured
-captured_black = []  # Black pieces that got captured
+@dataclass
+class GameState:
+    """Mutable per-game state packed into one object, so the hot paths do
+    fast attribute loads on a single instance instead of module-global
+    lookups (and functions no longer need `global` declarations)."""
+    board: chess.Board = field(default_factory=chess.Board)
+    selected_sq: int | None = None
+    legal_targets: set = field(default_factory=set)
+    last_move: chess.Move | None = None
+    in_check: bool = False  # refreshed after each push, not re-derived per draw
+    game_over: bool = False
+    left_banner: str = ""   # shows YOU WON / YOU LOST / DRAW
+    right_banner: str = ""
+    # Captured pieces tracking
+    captured_white: list = field(default_factory=list)  # White pieces that got captured
+    captured_black: list = field(default_factory=list)  # Black pieces that got captured
+
+    def reset(self):
+        self.board = chess.Board()
+        self.selected_sq = None
+        self.legal_targets = set()
+        self.last_move = None
+        self.in_check = False
+        self.game_over = False
+        self.left_banner = self.right_banner = ""
+        self.captured_white.clear()
+        self.captured_black.clear()
+
+gs = GameState()
 
 # -------------------- UI state --------------------
 show_scoreboard = False
 last_close_rect = None
 
 # -------------------- Assets --------------------
+# Decoded/scaled piece surfaces keyed by (code, size) so the same PNG is
+# never decoded or rescaled twice, whatever size a caller asks for.
+_image_cache = {}
+_decoded_cache = {}
+
+# Single sprite atlas: one PNG decode for all 12 pieces, sliced into
+# shared-memory subsurfaces. Individual per-piece PNGs remain the fallback.
+PIECE_CODES = ("wp", "wn", "wb", "wr", "wq", "wk",
+               "bp", "bn", "bb", "br", "bq", "bk")
+ATLAS_PATH = os.path.join(ASSETS_DIR, "atlas.png")
+ATLAS_TILE = 256
+
+def _load_atlas():
+    """Decode the atlas once (if present) into the decoded-surface cache."""
+    if not os.path.exists(ATLAS_PATH):
+        return
+    atlas = pygame.image.load(ATLAS_PATH).convert_alpha()
+    for i, code in enumerate(PIECE_CODES):
+        _decoded_cache[code] = atlas.subsurface(
+            pygame.Rect(i * ATLAS_TILE, 0, ATLAS_TILE, ATLAS_TILE))
+
+_COLORKEY = (255, 0, 255)
+
+def _has_binary_alpha(surf):
+    """True when every pixel is fully opaque or fully transparent."""
+    alpha = pygame.image.tobytes(surf, "RGBA")[3::4]
+    return not (set(alpha) - {0, 255})
+
+def _to_colorkey(surf):
+    """Convert a hard-masked alpha surface to an opaque colorkey surface,
+    whose blit path is much cheaper than per-pixel alpha blending."""
+    opaque = pygame.Surface(surf.get_size())
+    opaque.fill(_COLORKEY)
+    opaque.blit(surf, (0, 0))
+    opaque = opaque.convert()
+    opaque.set_colorkey(_COLORKEY)
+    return opaque
+
+def load_piece_image(code, size):
+    """Return the piece surface for e.g. ('wq', 72), or None if missing."""
+    key = (code, size)
+    if key in _image_cache:
+        return _image_cache[key]
+    if not _decoded_cache:
+        _load_atlas()
+    raw = _decoded_cache.get(code)
+    if raw is None and code not in _decoded_cache:
+        path = os.path.join(ASSETS_DIR, f"{code}.png")
+        raw = pygame.image.load(path).convert_alpha() if os.path.exists(path) else None
+        _decoded_cache[code] = raw
+    img = None
+    if raw is not None:
+        # Re-convert after scaling so the result matches the display
+        # format and blits take the fast path.
+        img = pygame.transform.smoothscale(raw, (size, size)).convert_alpha()
+        if _has_binary_alpha(img):
+            img = _to_colorkey(img)
+    _image_cache[key] = img
+    return img
+
 def load_images(square_size):
     """Load piece images. Mapping is explicit to avoid mix-ups."""
     pieces = {}
@@ -93,16 +209,17 @@ def load_images(square_size):
         for color in (chess.WHITE, chess.BLACK):
             prefix = "w" if color == chess.WHITE else "b"
             code = f"{prefix}{letter}"
-            path = os.path.join(ASSETS_DIR, f"{code}.png")
-            img = None
-            if os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.smoothscale(img, (square_size, square_size))
-            pieces[(ptype, color)] = img
+            pieces[(ptype, color)] = load_piece_image(code, square_size)
     return pieces
 
 PIECES = load_images(SQ)
 
+# Flat view of PIECES indexed by (color << 3) | piece_type, avoiding the
+# tuple-key dict hash per piece in the draw loop.
+PIECES_LIST = [None] * 16
+for (_pt, _col), _img in PIECES.items():
+    PIECES_LIST[(_col << 3) | _pt] = _img
+
 # -------------------- Helpers: square <-> rc --------------------
 def square_from_rc_white_view(r, c):
     return chess.square(c, 7 - r)
@@ -110,28 +227,99 @@ def square_from_rc_white_view(r, c):
 def square_from_rc_black_view(r, c):
     return chess.square(7 - c, r)
 
+# Precomputed square -> (row, col) tables so the draw loops do a single
+# index instead of recomputing file/rank per piece per frame.
+RC_WHITE = tuple((7 - (sq >> 3), sq & 7) for sq in range(64))
+RC_BLACK = tuple(((sq >> 3), 7 - (sq & 7)) for sq in range(64))
+
 def rc_from_square_for_white_view(sq):
-    f = chess.square_file(sq)
-    r = chess.square_rank(sq)
-    return (7 - r, f)
+    return RC_WHITE[sq]
 
 def rc_from_square_for_black_view(sq):
-    f = chess.square_file(sq)
-    r = chess.square_rank(sq)
-    return (r, 7 - f)
+    return RC_BLACK[sq]
+
+# Absolute pixel position of each square on each board, so the piece-draw
+# loop is a table lookup plus a list append feeding one blits() call.
+XY_LEFT  = tuple((LEFT_ANCHOR[0] + COORD_PAD + cc * SQ,
+                  LEFT_ANCHOR[1] + COORD_PAD + rr * SQ)
+                 for rr, cc in RC_WHITE)
+XY_RIGHT = tuple((RIGHT_ANCHOR[0] + COORD_PAD + cc * SQ,
+                  RIGHT_ANCHOR[1] + COORD_PAD + rr * SQ)
+                 for rr, cc in RC_BLACK)
 
 # -------------------- Draw functions --------------------
 TRAY_ICON = 24
 TRAY_GAP  = 4
 
+# Tray rows for partial repaints. The top tray (y=30, 24px icons) overhangs
+# TOP_BANNER into the right board rect, so a board-only repaint must restore
+# and redraw it or the board background chops off the icon bottoms.
+TRAY_RECT_TOP    = pygame.Rect(RIGHT_ANCHOR[0], 30, W_BOARD, TRAY_ICON)
+TRAY_RECT_BOTTOM = pygame.Rect(LEFT_ANCHOR[0], TOP_BANNER + H_BOARD + 36,
+                               W_BOARD, TRAY_ICON)
+
 piece_rank = {chess.PAWN:0, chess.KNIGHT:1, chess.BISHOP:1, chess.ROOK:2, chess.QUEEN:3}
 
-def draw_captured_trays():
+def build_board_bg(flipped=False):
+    """Pre-render the static checkerboard plus coordinate labels once;
+    draw_side just blits it."""
+    surf = pygame.Surface((W_BOARD, H_BOARD)).convert()
+    surf.fill(BG)
+    for r in range(BOARD_SIZE):
+        for c in range(BOARD_SIZE):
+            rr = r if not flipped else (BOARD_SIZE - 1 - r)
+            cc = c if not flipped else (BOARD_SIZE - 1 - c)
+            color = LIGHT if (rr + cc) % 2 == 0 else DARK
+            rect = pygame.Rect(c * SQ + COORD_PAD, r * SQ + COORD_PAD, SQ, SQ)
+            pygame.draw.rect(surf, color, rect)
+
+    # File letters along the bottom edge and rank numbers on the left edge,
+    # respecting the board orientation (flipped for black).
+    files = "abcdefgh" if not flipped else "hgfedcba"
+    ranks = "87654321" if not flipped else "12345678"
+    for c in range(8):
+        label = coord_font.render(files[c].upper(), True, COORD_COLOR)
+        rect = label.get_rect(center=(COORD_PAD + c * SQ + SQ//2,
+                                      H_BOARD - COORD_PAD//2))
+        surf.blit(label, rect)
+    for r in range(8):
+        label = coord_font.render(ranks[r], True, COORD_COLOR)
+        rect = label.get_rect(center=(COORD_PAD//2,
+                                      COORD_PAD + r * SQ + SQ//2))
+        surf.blit(label, rect)
+    return surf
+
+BOARD_BG_WHITE = build_board_bg(flipped=False)
+BOARD_BG_BLACK = build_board_bg(flipped=True)
+
+# Batched blitting: pygame-ce's fblits skips the per-item flag/area parsing
+# that blits does; fall back to blits on vanilla pygame.
+if hasattr(screen, "fblits"):
+    def batch_blit(seq):
+        screen.fblits(seq)
+else:
+    def batch_blit(seq):
+        screen.blits(seq, doreturn=False)
+
+# Legal-move dot, rasterized once; the per-frame dot pass is one batched blit.
+DOT_RADIUS = max(6, SQ // 10)
+DOT_SURF = pygame.Surface((2 * DOT_RADIUS, 2 * DOT_RADIUS), pygame.SRCALPHA)
+pygame.draw.circle(DOT_SURF, DOT, (DOT_RADIUS, DOT_RADIUS), DOT_RADIUS)
+DOT_OFFSET = SQ // 2 - DOT_RADIUS  # from square corner to dot corner
+
+# Highlight outlines, rasterized once per border width; the draw pass blits
+# them instead of re-rasterizing rect outlines every frame.
+HILITE3 = pygame.Surface((SQ, SQ), pygame.SRCALPHA)
+pygame.draw.rect(HILITE3, HILITE, HILITE3.get_rect(), width=3)
+HILITE4 = pygame.Surface((SQ, SQ), pygame.SRCALPHA)
+pygame.draw.rect(HILITE4, HILITE, HILITE4.get_rect(), width=4)
+
+def draw_captured_trays(gs):
     # ---- Eliminated WHITE pieces (captured by Black) ----
     # Show above the Black board, inside TOP_BANNER
     x = RIGHT_ANCHOR[0] + COORD_PAD
     y = 30  # fits under your "YOU ARE BLACK" title; bump if needed
-    for ptype in sorted(captured_white, key=lambda t: (piece_rank.get(t, 9), t)):
+    for ptype in sorted(gs.captured_white, key=lambda t: (piece_rank.get(t, 9), t)):
         img = PIECES.get((ptype, chess.WHITE))
         if img:
             icon = pygame.transform.smoothscale(img, (TRAY_ICON, TRAY_ICON))
@@ -142,197 +330,222 @@ def draw_captured_trays():
     # Show under the White board, inside BOTTOM_BANNER (above the hint line)
     x = LEFT_ANCHOR[0] + COORD_PAD
     y = TOP_BANNER + H_BOARD + 36  # below the result/turn text
-    for ptype in sorted(captured_black, key=lambda t: (piece_rank.get(t, 9), t)):
+    for ptype in sorted(gs.captured_black, key=lambda t: (piece_rank.get(t, 9), t)):
         img = PIECES.get((ptype, chess.BLACK))
         if img:
             icon = pygame.transform.smoothscale(img, (TRAY_ICON, TRAY_ICON))
             screen.blit(icon, (x, y))
             x += TRAY_ICON + TRAY_GAP
-def draw_board(anchor, flipped=False):
-    ax, ay = anchor
-    for r in range(BOARD_SIZE):
-        for c in range(BOARD_SIZE):
-            rr = r if not flipped else (BOARD_SIZE - 1 - r)
-            cc = c if not flipped else (BOARD_SIZE - 1 - c)
-            color = LIGHT if (rr + cc) % 2 == 0 else DARK
-            rect = pygame.Rect(ax + c * SQ + COORD_PAD, ay + r * SQ + COORD_PAD, SQ, SQ)
-            pygame.draw.rect(screen, color, rect)
+def draw_side(gs, anchor, flipped=False, piece_map=None):
+    """One fused pass per board: cached background, dynamic overlays
+    (last move, selection, legal dots), then batched piece blits."""
+    if piece_map is None:
+        piece_map = gs.board.piece_map()
+    xy_table = XY_RIGHT if flipped else XY_LEFT
+
+    screen.blit(BOARD_BG_BLACK if flipped else BOARD_BG_WHITE, anchor)
 
     # last move highlight
-    if last_move:
-        for sq in (last_move.from_square, last_move.to_square):
-            rr, cc = (rc_from_square_for_white_view(sq) if not flipped
-                      else rc_from_square_for_black_view(sq))
-            rect = pygame.Rect(ax + COORD_PAD + cc * SQ, ay + COORD_PAD + rr * SQ, SQ, SQ)
-            pygame.draw.rect(screen, HILITE, rect, width=3)
+    if gs.last_move:
+        for sq in (gs.last_move.from_square, gs.last_move.to_square):
+            screen.blit(HILITE3, xy_table[sq])
 
     # selected
-    if selected_sq is not None:
-        rr, cc = (rc_from_square_for_white_view(selected_sq) if not flipped
-                  else rc_from_square_for_black_view(selected_sq))
-        rect = pygame.Rect(ax + COORD_PAD + cc * SQ, ay + COORD_PAD + rr * SQ, SQ, SQ)
-        pygame.draw.rect(screen, HILITE, rect, width=4)
+    if gs.selected_sq is not None:
+        screen.blit(HILITE4, xy_table[gs.selected_sq])
 
     # legal targets dots
-    if selected_sq is not None and legal_targets:
-        for tsq in legal_targets:
-            rr, cc = (rc_from_square_for_white_view(tsq) if not flipped
-                      else rc_from_square_for_black_view(tsq))
-            cx = ax + COORD_PAD + cc * SQ + SQ // 2
-            cy = ay + COORD_PAD + rr * SQ + SQ // 2
-            pygame.draw.circle(screen, DOT, (cx, cy), max(6, SQ // 10))
-
-
-def draw_pieces(anchor, flipped=False):
-    ax, ay = anchor
-    for sq in chess.SQUARES:
-        piece = board.piece_at(sq)
-        if not piece:
-            continue
-        rr, cc = (rc_from_square_for_white_view(sq) if not flipped
-                  else rc_from_square_for_black_view(sq))
-        x = ax + COORD_PAD + cc * SQ
-        y = ay + COORD_PAD + rr * SQ
-        img = PIECES[(piece.piece_type, piece.color)]
+    if gs.selected_sq is not None and gs.legal_targets:
+        batch_blit([(DOT_SURF, (xy_table[tsq][0] + DOT_OFFSET,
+                                xy_table[tsq][1] + DOT_OFFSET))
+                    for tsq in gs.legal_targets])
+
+    # pieces
+    blit_list = []
+    for sq, piece in piece_map.items():
+        x, y = xy_table[sq]
+        img = PIECES_LIST[(piece.color << 3) | piece.piece_type]
         if img:
-            screen.blit(img, (x, y))
+            blit_list.append((img, (x, y)))
         else:
-            # very small fallback
+            # very small fallback — glyphs come from the memoized text cache,
+            # so missing art costs a render once, not once per square per frame
             letter = "PNBRQK"[piece.piece_type-1]
             color = (20,20,20) if piece.color else (240,240,240)
-            surf = turn_font.render(letter, True, color)
+            surf = render_text(turn_font, letter, color)
             rect = surf.get_rect(center=(x+SQ//2, y+SQ//2))
-            screen.blit(surf, rect)
-
-def draw_coords(anchor, flipped=False):
-    """Draw file letters along the bottom edge squares and rank numbers on the left edge squares,
-    respecting the board orientation (flipped for black). Labels are drawn inside the edge squares
-    so we don't need extra window padding."""
-    ax, ay = anchor
-
-    files = "abcdefgh" if not flipped else "hgfedcba"
-    ranks = "87654321" if not flipped else "12345678"
-
-    # Files (below the bottom row)
-    for c in range(8):
-        ch = files[c].upper()
-        surf = coord_font.render(ch, True, COORD_COLOR)
-        rect = surf.get_rect(center=(ax + COORD_PAD + c * SQ + SQ//2,
-                                     ay + H_BOARD - COORD_PAD//2))
-        screen.blit(surf, rect)
-
-    # Ranks (left of the left column)
-    for r in range(8):
-        ch = ranks[r]
-        surf = coord_font.render(ch, True, COORD_COLOR)
-        rect = surf.get_rect(center=(ax + COORD_PAD//2,
-                                     ay + COORD_PAD + r * SQ + SQ//2))
-        screen.blit(surf, rect)
-
-def draw_banners():
-    # titles
-    screen.blit(title_font.render("YOU ARE WHITE", True, ACCENT), (LEFT_ANCHOR[0], 10))
-    screen.blit(title_font.render("YOU ARE BLACK", True, ACCENT), (RIGHT_ANCHOR[0], 10))
-
-    if not game_over:
+            blit_list.append((surf, rect))
+    if blit_list:
+        batch_blit(blit_list)
+
+@lru_cache(maxsize=128)
+def render_text(font, text, color):
+    """Memoized font.render — banner/outcome strings repeat for many frames,
+    so each distinct string is rasterized exactly once."""
+    return font.render(text, True, color).convert_alpha()
+
+# Banner text never varies while drawn, so rasterize once and blit forever.
+TITLE_WHITE_SURF = render_text(title_font, "YOU ARE WHITE", ACCENT)
+TITLE_BLACK_SURF = render_text(title_font, "YOU ARE BLACK", ACCENT)
+YOUR_TURN_SURF   = render_text(turn_font, "YOUR TURN", ACCENT)
+THEIR_TURN_SURF  = render_text(turn_font, "THEIR TURN", ACCENT)
+HINT_SURF = render_text(turn_font, "Press Q to quit    |    Press R to reset board    |    Press S to scoreboard", (180, 180, 180))
+CHECK_SURF = render_text(check_font, "- CHECK!", ACCENT)
+
+# Fixed banner label positions — all arithmetic hoisted out of draw_banners.
+TURN_BANNER_Y   = TOP_BANNER + H_BOARD + 8
+CHECK_POS_WHITE = (LEFT_ANCHOR[0] + 180, TOP_BANNER - 32)
+CHECK_POS_BLACK = (RIGHT_ANCHOR[0] + 180, TOP_BANNER - 32)
+HINT_POS        = (WIN_W // 2 - HINT_SURF.get_width() // 2, WIN_H - 24)
+
+def build_static_bg():
+    """Compose everything that never changes — window fill, both board
+    backgrounds, side titles, bottom hint — into one whole-window surface,
+    so a full redraw starts from a single blit instead of a fill plus
+    several static blits."""
+    surf = pygame.Surface((WIN_W, WIN_H)).convert()
+    surf.fill(BG)
+    surf.blit(BOARD_BG_WHITE, LEFT_ANCHOR)
+    surf.blit(BOARD_BG_BLACK, RIGHT_ANCHOR)
+    surf.blit(TITLE_WHITE_SURF, (LEFT_ANCHOR[0], 10))
+    surf.blit(TITLE_BLACK_SURF, (RIGHT_ANCHOR[0], 10))
+    surf.blit(HINT_SURF, HINT_POS)
+    return surf
+
+STATIC_BG = build_static_bg()
+
+def draw_banners(gs):
+    # (titles and the bottom hint live in STATIC_BG)
+    if not gs.game_over:
         # normal turn banners
-        left_turn = (board.turn == chess.WHITE)
-        screen.blit(turn_font.render("YOUR TURN" if left_turn else "THEIR TURN", True, ACCENT),
-                    (LEFT_ANCHOR[0], TOP_BANNER + H_BOARD + 8))
-        screen.blit(turn_font.render("THEIR TURN" if left_turn else "YOUR TURN", True, ACCENT),
-                    (RIGHT_ANCHOR[0], TOP_BANNER + H_BOARD + 8))
+        left_turn = (gs.board.turn == chess.WHITE)
+        screen.blit(YOUR_TURN_SURF if left_turn else THEIR_TURN_SURF,
+                    (LEFT_ANCHOR[0], TURN_BANNER_Y))
+        screen.blit(THEIR_TURN_SURF if left_turn else YOUR_TURN_SURF,
+                    (RIGHT_ANCHOR[0], TURN_BANNER_Y))
     else:
         # show outcome banners per side
-        if left_banner:
-            screen.blit(turn_font.render(left_banner, True, ACCENT),
-                        (LEFT_ANCHOR[0], TOP_BANNER + H_BOARD + 8))
-        if right_banner:
-            screen.blit(turn_font.render(right_banner, True, ACCENT),
-                        (RIGHT_ANCHOR[0], TOP_BANNER + H_BOARD + 8))
+        if gs.left_banner:
+            screen.blit(render_text(turn_font, gs.left_banner, ACCENT),
+                        (LEFT_ANCHOR[0], TURN_BANNER_Y))
+        if gs.right_banner:
+            screen.blit(render_text(turn_font, gs.right_banner, ACCENT),
+                        (RIGHT_ANCHOR[0], TURN_BANNER_Y))
 
     # CHECK warning (only if game not over)
-    if board.is_check() and not game_over:
-        if board.turn == chess.WHITE:
-            pos = (LEFT_ANCHOR[0] + 180,  TOP_BANNER - 32)
-        else:
-            pos = (RIGHT_ANCHOR[0] + 180, TOP_BANNER - 32)
-        screen.blit(check_font.render("- CHECK!", True, ACCENT), pos)
-
-    # Always show keystroke hints centered at the bottom
-    hint = turn_font.render("Press Q to quit    |    Press R to reset board    |    Press S to scoreboard", True, (180, 180, 180))
-    screen.blit(hint, (WIN_W // 2 - hint.get_width() // 2, WIN_H - 24))
+    if gs.in_check and not gs.game_over:
+        pos = CHECK_POS_WHITE if gs.board.turn == chess.WHITE else CHECK_POS_BLACK
+        screen.blit(CHECK_SURF, pos)
 
 
 
 # -------------------- Input helpers --------------------
+# Hit-test bounds as plain module-level ints; the two boards are adjacent
+# known-size rectangles, so picking the candidate by x collapses the test
+# to a single range check.
+LEFT_X0, LEFT_Y0 = LEFT_ANCHOR
+RIGHT_X0, RIGHT_Y0 = RIGHT_ANCHOR
+_BOARD_HIT = (
+    (LEFT_X0, LEFT_Y0, square_from_rc_white_view),
+    (RIGHT_X0, RIGHT_Y0, square_from_rc_black_view),
+)
+
 def board_click_to_square(pos):
     mx, my = pos
-    lx, ly = LEFT_ANCHOR
-    if lx <= mx < lx + W_BOARD and ly <= my < ly + H_BOARD:
-        c = (mx - lx - COORD_PAD) // SQ
-        r = (my - ly - COORD_PAD) // SQ
-        return square_from_rc_white_view(r, c)
-    rx, ry = RIGHT_ANCHOR
-    if rx <= mx < rx + W_BOARD and ry <= my < ry + H_BOARD:
-        c = (mx - rx - COORD_PAD) // SQ
-        r = (my - ry - COORD_PAD) // SQ
-        return square_from_rc_black_view(r, c)
+    x0, y0, to_square = _BOARD_HIT[mx >= RIGHT_X0]
+    c = (mx - x0 - COORD_PAD) // SQ
+    r = (my - y0 - COORD_PAD) // SQ
+    # Bound to the playable 8x8 area — a click in the coordinate-pad margin
+    # would otherwise map to a square index off the board.
+    if 0 <= c < 8 and 0 <= r < 8:
+        return to_square(r, c)
     return None
 
-def update_legal_targets():
-    global legal_targets
-    legal_targets = set()
-    if selected_sq is None: return
-    for mv in board.legal_moves:
-        if mv.from_square == selected_sq:
-            legal_targets.add(mv.to_square)
+# Generated moves per source square for the current position, keyed by
+# destination; invalidated whenever the position changes. Both the target
+# dots and the click handler read from it, so a click replays the already-
+# generated Move instead of running legal-move generation a second time.
+_moves_cache = {}
+
+def _moves_from(gs, sq):
+    move_map = _moves_cache.get(sq)
+    if move_map is None:
+        # Restrict generation at the bitboard level instead of generating
+        # every legal move in the position and filtering by from_square.
+        # Promotion variants share a destination; keeping the first is
+        # enough — if one is legal, all four are.
+        move_map = {}
+        for mv in gs.board.generate_legal_moves(
+                from_mask=chess.BB_SQUARES[sq]):
+            move_map.setdefault(mv.to_square, mv)
+        _moves_cache[sq] = move_map
+    return move_map
+
+def update_legal_targets(gs):
+    if gs.selected_sq is None:
+        gs.legal_targets = set()
+        return
+    gs.legal_targets = set(_moves_from(gs, gs.selected_sq))
 
 # -------------------- db helpers --------------------
 
+# One connection for the app's lifetime — opening a SQLite file per query
+# costs milliseconds (lock + schema parse) vs microseconds for the queries
+# themselves on a table this small.
+_DB = None
+
 def db_init():
-    with sqlite3.connect(DB_PATH) as con:
-        con.executescript("""
-        CREATE TABLE IF NOT EXISTS results (
-          id          INTEGER PRIMARY KEY,
-          ts          TEXT NOT NULL,          -- ISO timestamp
-          result      TEXT NOT NULL,          -- CHECKMATE/STALEMATE/RESIGN/...
-          winner_col  TEXT,                   -- 'White'/'Black' or NULL on draw
-          loser_col   TEXT,                   -- 'Black'/'White' or NULL on draw
-          winner_name TEXT,
-          loser_name  TEXT,
-          move_count  INTEGER NOT NULL
-        );
-        CREATE INDEX IF NOT EXISTS idx_results_players ON results(winner_name, loser_name);
-        CREATE INDEX IF NOT EXISTS idx_results_ts ON results(ts);
-        """)
+    global _DB
+    _DB = sqlite3.connect(DB_PATH, check_same_thread=False)
+    _DB.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    CREATE TABLE IF NOT EXISTS results (
+      id          INTEGER PRIMARY KEY,
+      ts          TEXT NOT NULL,          -- ISO timestamp
+      result      TEXT NOT NULL,          -- CHECKMATE/STALEMATE/RESIGN/...
+      winner_col  TEXT,                   -- 'White'/'Black' or NULL on draw
+      loser_col   TEXT,                   -- 'Black'/'White' or NULL on draw
+      winner_name TEXT,
+      loser_name  TEXT,
+      move_count  INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_results_players ON results(winner_name, loser_name);
+    CREATE INDEX IF NOT EXISTS idx_results_ts ON results(ts);
+    """)
+    return _DB
+
+def _db():
+    return _DB if _DB is not None else db_init()
 
 def db_insert(ts, result, winner_col, loser_col, winner_name, loser_name, move_count):
-    with sqlite3.connect(DB_PATH) as con:
-        con.execute(
-            """INSERT INTO results
-               (ts, result, winner_col, loser_col, winner_name, loser_name, move_count)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (ts, result, winner_col, loser_col, winner_name, loser_name, move_count)
-        )
+    global _scoreboard_surf
+    con = _db()
+    con.execute(
+        """INSERT INTO results
+           (ts, result, winner_col, loser_col, winner_name, loser_name, move_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (ts, result, winner_col, loser_col, winner_name, loser_name, move_count)
+    )
+    con.commit()
+    _scoreboard_surf = None  # cached scoreboard panel is now stale
 
 def db_fetch_recent(limit=12):
-    with sqlite3.connect(DB_PATH) as con:
-        return con.execute(
-            "SELECT ts, result, winner_col, loser_col, winner_name, loser_name, move_count "
-            "FROM results ORDER BY ts DESC LIMIT ?", (limit,)
-        ).fetchall()
+    return _db().execute(
+        "SELECT ts, result, winner_col, loser_col, winner_name, loser_name, move_count "
+        "FROM results ORDER BY ts DESC LIMIT ?", (limit,)
+    ).fetchall()
 
 def db_fetch_top(limit=8):
-    with sqlite3.connect(DB_PATH) as con:
-        return con.execute(
-            "SELECT winner_name, COUNT(*) AS wins "
-            "FROM results WHERE winner_name IS NOT NULL "
-            "GROUP BY winner_name ORDER BY wins DESC, winner_name ASC LIMIT ?", (limit,)
-        ).fetchall()
+    return _db().execute(
+        "SELECT winner_name, COUNT(*) AS wins "
+        "FROM results WHERE winner_name IS NOT NULL "
+        "GROUP BY winner_name ORDER BY wins DESC, winner_name ASC LIMIT ?", (limit,)
+    ).fetchall()
 
 
 # -------------------- Result prompt and scoreboard --------------------
-def prompt_save_result(result_label, winner_color):
+def prompt_save_result(gs, result_label, winner_color):
     """
     Modal prompt to enter winner & loser names, then save to SQLite.
     Controls: type text • TAB switches field • ENTER saves • ESC cancels
@@ -345,40 +558,45 @@ def prompt_save_result(result_label, winner_color):
     winner_text, loser_text = "", ""
     active = 0  # 0 winner, 1 loser
     who_won = "White" if winner_color is chess.WHITE else ("Black" if winner_color is chess.BLACK else "—")
-    title = banner_font.render(f"Result: {result_label}", True, (20,20,20))
-    sub   = turn_font.render(f"Winner: {who_won}", True, (20,20,20))
+    title = render_text(banner_font, f"Result: {result_label}", (20,20,20))
+    sub   = render_text(turn_font, f"Winner: {who_won}", (20,20,20))
 
+    # Event-driven modal: repaint only after a state-changing event, and
+    # block in event.wait between events instead of spinning at 60 Hz.
+    redraw = True
     while True:
-        overlay = pygame.Surface((WIN_W, WIN_H), pygame.SRCALPHA); overlay.fill((0,0,0,160))
-        screen.blit(overlay, (0,0))
-
-        pygame.draw.rect(screen, (245,245,245), rect, border_radius=12)
-        pygame.draw.rect(screen, (40,40,40), rect, width=3, border_radius=12)
-        screen.blit(title, (rect.centerx - title.get_width()//2, rect.y + 12))
-        screen.blit(sub,   (rect.centerx - sub.get_width()//2,   rect.y + 54))
-
-        win_label = turn_font.render("Winner name:", True, (30,30,30))
-        screen.blit(win_label, (rect.x + 22, rect.y + 96))
-        win_box = pygame.Rect(rect.x + 170, rect.y + 92, field_w, field_h)
-        pygame.draw.rect(screen, (255,255,255), win_box, border_radius=8)
-        pygame.draw.rect(screen, (230,80,80) if active==0 else (120,120,120), win_box, width=2, border_radius=8)
-        screen.blit(turn_font.render(winner_text, True, (30,30,30)), (win_box.x + 10, win_box.y + 8))
-
-        lose_label = turn_font.render("Loser name:", True, (30,30,30))
-        screen.blit(lose_label, (rect.x + 22, rect.y + 96 + gap_y))
-        lose_box = pygame.Rect(rect.x + 170, rect.y + 92 + gap_y, field_w, field_h)
-        pygame.draw.rect(screen, (255,255,255), lose_box, border_radius=8)
-        pygame.draw.rect(screen, (230,80,80) if active==1 else (120,120,120), lose_box, width=2, border_radius=8)
-        screen.blit(turn_font.render(loser_text, True, (30,30,30)), (lose_box.x + 10, lose_box.y + 8))
-
-        foot = coord_font.render("TAB switch • ENTER save • ESC cancel", True, (60,60,60))
-        screen.blit(foot, (rect.centerx - foot.get_width()//2, rect.bottom - 26))
-
-        pygame.display.flip()
-
-        for e in pygame.event.get():
+        if redraw:
+            screen.blit(OVERLAY_SURF, (0,0))
+
+            pygame.draw.rect(screen, (245,245,245), rect, border_radius=12)
+            pygame.draw.rect(screen, (40,40,40), rect, width=3, border_radius=12)
+            screen.blit(title, (rect.centerx - title.get_width()//2, rect.y + 12))
+            screen.blit(sub,   (rect.centerx - sub.get_width()//2,   rect.y + 54))
+
+            win_label = render_text(turn_font, "Winner name:", (30,30,30))
+            screen.blit(win_label, (rect.x + 22, rect.y + 96))
+            win_box = pygame.Rect(rect.x + 170, rect.y + 92, field_w, field_h)
+            pygame.draw.rect(screen, (255,255,255), win_box, border_radius=8)
+            pygame.draw.rect(screen, (230,80,80) if active==0 else (120,120,120), win_box, width=2, border_radius=8)
+            screen.blit(turn_font.render(winner_text, True, (30,30,30)), (win_box.x + 10, win_box.y + 8))
+
+            lose_label = render_text(turn_font, "Loser name:", (30,30,30))
+            screen.blit(lose_label, (rect.x + 22, rect.y + 96 + gap_y))
+            lose_box = pygame.Rect(rect.x + 170, rect.y + 92 + gap_y, field_w, field_h)
+            pygame.draw.rect(screen, (255,255,255), lose_box, border_radius=8)
+            pygame.draw.rect(screen, (230,80,80) if active==1 else (120,120,120), lose_box, width=2, border_radius=8)
+            screen.blit(turn_font.render(loser_text, True, (30,30,30)), (lose_box.x + 10, lose_box.y + 8))
+
+            foot = render_text(coord_font, "TAB switch • ENTER save • ESC cancel", (60,60,60))
+            screen.blit(foot, (rect.centerx - foot.get_width()//2, rect.bottom - 26))
+
+            pygame.display.flip()
+            redraw = False
+
+        for e in [pygame.event.wait()] + pygame.event.get():
             if e.type == pygame.QUIT: pygame.quit(); sys.exit()
             if e.type == pygame.KEYDOWN:
+                redraw = True
                 if e.key == pygame.K_ESCAPE: return
                 if e.key == pygame.K_TAB: active = 1 - active
                 elif e.key == pygame.K_RETURN:
@@ -387,7 +605,7 @@ def prompt_save_result(result_label, winner_color):
                     loser_col  = "Black" if winner_color is chess.WHITE else ("White" if winner_color is chess.BLACK else None)
                     db_insert(ts, result_label, winner_col, loser_col,
                               winner_text.strip() or None, loser_text.strip() or None,
-                              len(board.move_stack))
+                              len(gs.board.move_stack))
                     return
                 elif e.key == pygame.K_BACKSPACE:
                     if active==0 and winner_text: winner_text = winner_text[:-1]
@@ -399,23 +617,29 @@ def prompt_save_result(result_label, winner_color):
                         elif active==1 and len(loser_text) < 30: loser_text += ch
 
 
-def draw_scoreboard():
-    """Top overlay showing Top Players + Recent Games. Returns the close button rect."""
-    global last_close_rect
+# The composed scoreboard panel; rebuilt only when the DB contents change
+# (invalidated by db_insert), not on every draw.
+_scoreboard_surf = None
+_scoreboard_close_rect = None
+
+def _build_scoreboard_surf():
+    """Compose the full panel (frame, headers, rows) onto one transparent
+    whole-window surface; drawing it later is a single blit."""
+    global _scoreboard_surf, _scoreboard_close_rect
+    surf = pygame.Surface((WIN_W, WIN_H), pygame.SRCALPHA)
     panel_h = int(WIN_H * 0.68)
     rect = pygame.Rect(12, 8, WIN_W - 24, panel_h)
 
-    pygame.draw.rect(screen, (245,245,245), rect, border_radius=14)
-    pygame.draw.rect(screen, (40,40,40), rect, width=3, border_radius=14)
+    pygame.draw.rect(surf, (245,245,245), rect, border_radius=14)
+    pygame.draw.rect(surf, (40,40,40), rect, width=3, border_radius=14)
 
-    title = banner_font.render("Scoreboard", True, (20,20,20))
-    screen.blit(title, (rect.x + 16, rect.y + 10))
+    title = render_text(banner_font, "Scoreboard", (20,20,20))
+    surf.blit(title, (rect.x + 16, rect.y + 10))
 
     close_rect = pygame.Rect(rect.right - 46, rect.y + 10, 36, 28)
-    pygame.draw.rect(screen, (230,80,80), close_rect, border_radius=6)
-    xlbl = turn_font.render("X", True, (255,255,255))
-    screen.blit(xlbl, (close_rect.centerx - xlbl.get_width()//2, close_rect.centery - xlbl.get_height()//2))
-    last_close_rect = close_rect
+    pygame.draw.rect(surf, (230,80,80), close_rect, border_radius=6)
+    xlbl = render_text(turn_font, "X", (255,255,255))
+    surf.blit(xlbl, (close_rect.centerx - xlbl.get_width()//2, close_rect.centery - xlbl.get_height()//2))
 
     recent = db_fetch_recent(12)
     top    = db_fetch_top(10)
@@ -424,22 +648,20 @@ def draw_scoreboard():
     right_x = rect.centerx + 20
     y0 = rect.y + 54
 
-    h1 = turn_font.render("Top Players (wins)", True, (20,20,20))
-    screen.blit(h1, (left_x, y0))
+    h1 = render_text(turn_font, "Top Players (wins)", (20,20,20))
+    surf.blit(h1, (left_x, y0))
     y = y0 + 8 + h1.get_height()
-    row_font = pygame.font.SysFont(None, 22)
     if top:
         for i, (name, wins) in enumerate(top):
             line = f"{i+1:>2}. {name or '(unknown)'} — {wins}"
-            screen.blit(row_font.render(line, True, (30,30,30)), (left_x, y + i*24))
+            surf.blit(render_text(row_font, line, (30,30,30)), (left_x, y + i*24))
     else:
-        screen.blit(row_font.render("(no wins yet)", True, (120,120,120)), (left_x, y))
+        surf.blit(render_text(row_font, "(no wins yet)", (120,120,120)), (left_x, y))
 
-    h2 = turn_font.render("Recent Games", True, (20,20,20))
-    screen.blit(h2, (right_x, y0))
+    h2 = render_text(turn_font, "Recent Games", (20,20,20))
+    surf.blit(h2, (right_x, y0))
     y2 = y0 + 8 + h2.get_height()
 
-    small = pygame.font.SysFont(None, 20)
     if recent:
         for i, (ts, result, wcol, lcol, wname, lname, moves) in enumerate(recent):
             label = f"{ts}  •  {result}"
@@ -448,194 +670,300 @@ def draw_scoreboard():
             else:
                 label += "  •  Draw"
             label += f"  •  {moves} moves"
-            screen.blit(small.render(label, True, (40,40,40)), (right_x, y2 + i*22))
+            surf.blit(render_text(small_font, label, (40,40,40)), (right_x, y2 + i*22))
     else:
-        screen.blit(small.render("(no games yet)", True, (120,120,120)), (right_x, y2))
+        surf.blit(render_text(small_font, "(no games yet)", (120,120,120)), (right_x, y2))
+
+    _scoreboard_surf = surf
+    _scoreboard_close_rect = close_rect
 
-    return close_rect
+def draw_scoreboard():
+    """Top overlay showing Top Players + Recent Games. Returns the close button rect."""
+    global last_close_rect
+    if _scoreboard_surf is None:
+        _build_scoreboard_surf()
+    screen.blit(_scoreboard_surf, (0, 0))
+    last_close_rect = _scoreboard_close_rect
+    return _scoreboard_close_rect
 
 # -------------------- Promotion Picker --------------------
-def choose_promotion(color):
-    """Modal overlay to pick Q/R/B/N. Returns a chess.* constant."""
-    # build small panel with 4 buttons showing piece PNGs
-    piece_types = [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]
+# Shared translucent backdrop for modal overlays, filled once at startup
+# instead of allocating a full-window SRCALPHA surface per modal frame.
+OVERLAY_SURF = pygame.Surface((WIN_W, WIN_H), pygame.SRCALPHA)
+OVERLAY_SURF.fill(OVERLAY_BG)
+
+# Panel geometry as module constants — shared by the panel composition and
+# the click-grid hit test.
+PROMO_TYPES = (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT)
+PROMO_PANEL_W, PROMO_PANEL_H = 420, 140
+PROMO_RECT = pygame.Rect((WIN_W - PROMO_PANEL_W)//2, (WIN_H - PROMO_PANEL_H)//2,
+                         PROMO_PANEL_W, PROMO_PANEL_H)
+PROMO_BTN = 80
+PROMO_GAP = 20
+PROMO_X0 = PROMO_RECT.x + (PROMO_PANEL_W - (4*PROMO_BTN + 3*PROMO_GAP))//2
+PROMO_Y0 = PROMO_RECT.y + (PROMO_PANEL_H - PROMO_BTN)//2
+
+# Fully composed picker panel per color, built on first use; opening the
+# picker again is two blits and a flip with zero allocation or scaling.
+_promo_panel_cache = {}
+
+def _build_promo_panel(color):
     codes = {chess.QUEEN:"q", chess.ROOK:"r", chess.BISHOP:"b", chess.KNIGHT:"n"}
     prefix = "w" if color == chess.WHITE else "b"
 
-    # panel geometry
-    panel_w, panel_h = 420, 140
-    rect = pygame.Rect((WIN_W - panel_w)//2, (WIN_H - panel_h)//2, panel_w, panel_h)
-    btn_w, btn_h = 80, 80
-    gap = 20
-    btns = []
-    x0 = rect.x + (panel_w - (4*btn_w + 3*gap))//2
-    y0 = rect.y + (panel_h - btn_h)//2
-
-    # pre-render buttons
-    buttons = []
-    for i,ptype in enumerate(piece_types):
-        code = f"{prefix}{codes[ptype]}"
-        img = PIECES.get((ptype, color))
+    panel_surf = pygame.Surface((PROMO_PANEL_W, PROMO_PANEL_H), pygame.SRCALPHA)
+    pygame.draw.rect(panel_surf, PANEL_BG, panel_surf.get_rect(), border_radius=12)
+    pygame.draw.rect(panel_surf, PANEL_EDGE, panel_surf.get_rect(), width=3, border_radius=12)
+    title = render_text(banner_font, "Promote pawn to…", (20,20,20))
+    panel_surf.blit(title, ((PROMO_PANEL_W - title.get_width())//2, 10))
+
+    bx0 = PROMO_X0 - PROMO_RECT.x
+    by0 = PROMO_Y0 - PROMO_RECT.y
+    for i, ptype in enumerate(PROMO_TYPES):
+        # button-sized piece surfaces come straight from the (code, size)
+        # image cache, so no smoothscale runs here after the first build
+        img = load_piece_image(f"{prefix}{codes[ptype]}", PROMO_BTN)
         if img is None:
             # tiny fallback: letter
-            img = pygame.Surface((SQ, SQ), pygame.SRCALPHA)
-            letter = "QRBN"[i]
-            s = banner_font.render(letter, True, (30,30,30))
-            img.blit(s, (SQ//2 - s.get_width()//2, SQ//2 - s.get_height()//2))
-        scaled = pygame.transform.smoothscale(img, (btn_w, btn_h))
-        rect_btn = pygame.Rect(x0 + i*(btn_w + gap), y0, btn_w, btn_h)
-        buttons.append((ptype, scaled, rect_btn))
-
-    # modal event loop
-    while True:
-        # overlay
-        overlay = pygame.Surface((WIN_W, WIN_H), pygame.SRCALPHA)
-        overlay.fill(OVERLAY_BG)
-        screen.blit(overlay, (0,0))
+            img = pygame.Surface((PROMO_BTN, PROMO_BTN), pygame.SRCALPHA)
+            s = banner_font.render("QRBN"[i], True, (30,30,30))
+            img.blit(s, (PROMO_BTN//2 - s.get_width()//2, PROMO_BTN//2 - s.get_height()//2))
+        bx = bx0 + i*(PROMO_BTN + PROMO_GAP)
+        panel_surf.blit(img, (bx, by0))
+        pygame.draw.rect(panel_surf, (50,50,50),
+                         pygame.Rect(bx, by0, PROMO_BTN, PROMO_BTN),
+                         width=2, border_radius=8)
+    return panel_surf
 
-        pygame.draw.rect(screen, PANEL_BG, rect, border_radius=12)
-        pygame.draw.rect(screen, PANEL_EDGE, rect, width=3, border_radius=12)
-
-        title = banner_font.render("Promote pawn to…", True, (20,20,20))
-        screen.blit(title, (rect.centerx - title.get_width()//2, rect.y + 10))
-
-        for ptype, surf, rbtn in buttons:
-            screen.blit(surf, rbtn.topleft)
-            pygame.draw.rect(screen, (50,50,50), rbtn, width=2, border_radius=8)
+def choose_promotion(color):
+    """Modal overlay to pick Q/R/B/N. Returns a chess.* constant."""
+    panel_surf = _promo_panel_cache.get(color)
+    if panel_surf is None:
+        panel_surf = _promo_panel_cache[color] = _build_promo_panel(color)
 
-        pygame.display.flip()
+    # modal event loop — the panel is static, so paint once and then block
+    # in event.wait instead of re-flipping at 60 Hz
+    screen.blit(OVERLAY_SURF, (0,0))
+    screen.blit(panel_surf, PROMO_RECT.topleft)
+    pygame.display.flip()
 
-        for e in pygame.event.get():
+    while True:
+        for e in [pygame.event.wait()] + pygame.event.get():
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if e.type == pygame.KEYDOWN and e.key in (pygame.K_ESCAPE, pygame.K_q):
                 return chess.QUEEN  # default if cancelled
             if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
-                for ptype, _, rbtn in buttons:
-                    if rbtn.collidepoint(e.pos):
-                        return ptype
+                # Buttons sit on a fixed grid: derive the index directly
+                # instead of scanning the four rects.
+                mx, my = e.pos
+                if PROMO_Y0 <= my < PROMO_Y0 + PROMO_BTN and mx >= PROMO_X0:
+                    idx, rem = divmod(mx - PROMO_X0, PROMO_BTN + PROMO_GAP)
+                    if idx < 4 and rem < PROMO_BTN:
+                        return PROMO_TYPES[idx]
 
 # -------------------- Move execution --------------------
-def attempt_move(src_sq, dst_sq):
+def attempt_move(gs, src_sq, dst_sq):
     """Make a legal move; if promotion is needed, open the picker."""
-    global last_move, captured_white, captured_black
-    move = chess.Move(src_sq, dst_sq)
-
-    # If plain move is illegal, but a promotion could make it legal:
-    if move not in board.legal_moves:
-        piece = board.piece_at(src_sq)
-        if piece and piece.piece_type == chess.PAWN:
-            rank = chess.square_rank(dst_sq)
-            if (piece.color == chess.WHITE and rank == 7) or (piece.color == chess.BLACK and rank == 0):
-                promo = choose_promotion(piece.color)
-                move = chess.Move(src_sq, dst_sq, promotion=promo)
-
-    if move in board.legal_moves:
-        if board.is_capture(move):
-            if board.is_en_passant(move):
-                cap_sq = chess.square(chess.square_file(move.to_square),
-                                      chess.square_rank(move.from_square))
+    board = gs.board
+
+    # The moves from src_sq were already generated (and cached) when the
+    # piece was selected; a click just replays the stored Move object.
+    move = _moves_from(gs, src_sq).get(dst_sq)
+    if move is None:
+        return False
+
+    if move.promotion:
+        promo = choose_promotion(board.piece_at(src_sq).color)
+        move = chess.Move(src_sq, dst_sq, promotion=promo)
+
+    if board.is_capture(move):
+        if board.is_en_passant(move):
+            cap_sq = chess.square(chess.square_file(move.to_square),
+                                  chess.square_rank(move.from_square))
+        else:
+            cap_sq = move.to_square
+        cap_piece = board.piece_at(cap_sq)
+        if cap_piece:
+            if cap_piece.color == chess.WHITE:
+                gs.captured_white.append(cap_piece.piece_type)
             else:
-                cap_sq = move.to_square
-            cap_piece = board.piece_at(cap_sq)
-            if cap_piece:
-                if cap_piece.color == chess.WHITE:
-                    captured_white.append(cap_piece.piece_type)
-                else:
-                    captured_black.append(cap_piece.piece_type)
+                gs.captured_black.append(cap_piece.piece_type)
 
-        board.push(move)
-        last_move = move
-        return True
-    return False
+    board.push(move)
+    _moves_cache.clear()
+    gs.last_move = move
+    gs.in_check = board.is_check()
+    return True
 
-def update_game_state_after_move():
+def update_game_state_after_move(gs):
     """Check checkmate/stalemate and set banners accordingly."""
-    global game_over, left_banner, right_banner
+    board = gs.board
     if board.is_checkmate():
         if board.turn == chess.WHITE:
-            left_banner, right_banner = "YOU LOST – CHECKMATE", "YOU WON – CHECKMATE"
+            gs.left_banner, gs.right_banner = "YOU LOST – CHECKMATE", "YOU WON – CHECKMATE"
             winner = chess.BLACK
         else:
-            left_banner, right_banner = "YOU WON – CHECKMATE", "YOU LOST – CHECKMATE"
+            gs.left_banner, gs.right_banner = "YOU WON – CHECKMATE", "YOU LOST – CHECKMATE"
             winner = chess.WHITE
-        game_over = True
-        prompt_save_result("CHECKMATE", winner)
+        gs.game_over = True
+        prompt_save_result(gs, "CHECKMATE", winner)
     elif board.is_stalemate():
-        left_banner = right_banner = "DRAW – STALEMATE"
-        game_over = True
-        prompt_save_result("STALEMATE", None)
+        gs.left_banner = gs.right_banner = "DRAW – STALEMATE"
+        gs.game_over = True
+        prompt_save_result(gs, "STALEMATE", None)
 
 # -------------------- Main loop --------------------
 def main():
-    global selected_sq, legal_targets, board, game_over, left_banner, right_banner, show_scoreboard, last_close_rect
+    global show_scoreboard, last_close_rect
     clock = pygame.time.Clock()
+    dirty = True          # full-screen change; redraw everything and flip
+    board_dirty = False   # only board content (selection/dots/move) changed
+    banners_dirty = False # turn/check banners and capture trays changed
 
     while True:
-        for e in pygame.event.get():
+        events = []
+        if not (dirty or board_dirty):
+            # Nothing to draw: block until an event arrives (or timeout).
+            e = pygame.event.wait(IDLE_EVENT_TIMEOUT_MS)
+            if e.type != pygame.NOEVENT:
+                events.append(e)
+        else:
+            pygame.event.pump()
+        # Drain with a plain get() so events keep their arrival order — a
+        # typed get() fetches per-type in list order and can reorder, e.g. a
+        # reset keypress ahead of an earlier click. Unhandled types (already
+        # thinned by set_blocked) just fall through the dispatch below.
+        events.extend(pygame.event.get())
+
+        for e in events:
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
+            if e.type in EXPOSE_EVENTS:
+                # window contents were lost; repaint everything
+                dirty = True
+                continue
             if e.type == pygame.KEYDOWN:
                 if e.key in (pygame.K_q, pygame.K_ESCAPE):
                     pygame.quit(); sys.exit()
                 if e.key == pygame.K_r:  # quick reset
-                    board = chess.Board()
-                    selected_sq = None
-                    legal_targets = set()
-                    game_over = False
-                    left_banner = right_banner = ""
-                    captured_white.clear()
-                    captured_black.clear()
+                    gs.reset()
+                    _moves_cache.clear()
+                    dirty = True
                 if e.key == pygame.K_s:
                     show_scoreboard = not show_scoreboard
+                    dirty = True
                     continue
                 if show_scoreboard and e.key == pygame.K_ESCAPE:
                     show_scoreboard = False
+                    dirty = True
                     continue
 
             if show_scoreboard and e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
                 if last_close_rect and last_close_rect.collidepoint(e.pos):
                     show_scoreboard = False
+                    dirty = True
                 continue
 
-            if not game_over and e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+            if not gs.game_over and e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
                 sq = board_click_to_square(e.pos)
                 if sq is None:
                     continue
-                piece = board.piece_at(sq)
+                piece = gs.board.piece_at(sq)
 
-                if selected_sq is None:
-                    if piece and piece.color == board.turn:
-                        selected_sq = sq
-                        update_legal_targets()
+                if gs.selected_sq is None:
+                    if piece and piece.color == gs.board.turn:
+                        gs.selected_sq = sq
+                        update_legal_targets(gs)
+                        board_dirty = True
                 else:
-                    if sq in legal_targets and attempt_move(selected_sq, sq):
-                        selected_sq = None
-                        legal_targets = set()
-                        update_game_state_after_move()
+                    if sq in gs.legal_targets and attempt_move(gs, gs.selected_sq, sq):
+                        gs.selected_sq = None
+                        gs.legal_targets = set()
+                        update_game_state_after_move(gs)
+                        if gs.game_over or (gs.last_move and gs.last_move.promotion):
+                            # a modal painted over the whole window
+                            dirty = True
+                        else:
+                            # only the boards + banner strips changed
+                            board_dirty = True
+                            banners_dirty = True
                     else:
                         # re-select your own piece
-                        if piece and piece.color == board.turn:
-                            selected_sq = sq
-                            update_legal_targets()
-
-        # draw
-        screen.fill(BG)
-        draw_board(LEFT_ANCHOR, flipped=False)
-        draw_board(RIGHT_ANCHOR, flipped=True)
-        draw_pieces(LEFT_ANCHOR, flipped=False)
-        draw_pieces(RIGHT_ANCHOR, flipped=True)
-        draw_coords(LEFT_ANCHOR, flipped=False)
-        draw_coords(RIGHT_ANCHOR, flipped=True)
-        draw_banners()
-        draw_captured_trays()
-        if show_scoreboard:
-            last_close_rect = draw_scoreboard()
-
-
-        pygame.display.flip()
-        clock.tick(60)
+                        if piece and piece.color == gs.board.turn:
+                            gs.selected_sq = sq
+                            update_legal_targets(gs)
+                            board_dirty = True
+
+        # draw (only when something changed; the scene is static between events)
+        if dirty:
+            screen.blit(STATIC_BG, (0, 0))
+            piece_map = gs.board.piece_map()
+            draw_side(gs, LEFT_ANCHOR, flipped=False, piece_map=piece_map)
+            draw_side(gs, RIGHT_ANCHOR, flipped=True, piece_map=piece_map)
+            draw_banners(gs)
+            draw_captured_trays(gs)
+            if show_scoreboard:
+                last_close_rect = draw_scoreboard()
+
+            pygame.display.flip()
+            dirty = False
+            board_dirty = False
+            banners_dirty = False
+            clock.tick(ACTIVE_FPS)
+        elif board_dirty:
+            # Localized repaint: only the board regions (and, after a move,
+            # the banner strips) changed — push just those rects.
+            update_rects = [BOARD_RECT_LEFT, BOARD_RECT_RIGHT]
+            if banners_dirty:
+                # restore the static content (titles/hint) in the strips
+                screen.blit(STATIC_BG, BANNER_RECT_TOP, BANNER_RECT_TOP)
+                screen.blit(STATIC_BG, BANNER_RECT_BOTTOM, BANNER_RECT_BOTTOM)
+            piece_map = gs.board.piece_map()
+            draw_side(gs, LEFT_ANCHOR, flipped=False, piece_map=piece_map)
+            draw_side(gs, RIGHT_ANCHOR, flipped=True, piece_map=piece_map)
+            # The board re-blit just erased the top tray's overhang into the
+            # right board rect: restore both tray rows from the static
+            # background and repaint them on every partial pass.
+            screen.blit(STATIC_BG, TRAY_RECT_TOP, TRAY_RECT_TOP)
+            screen.blit(STATIC_BG, TRAY_RECT_BOTTOM, TRAY_RECT_BOTTOM)
+            draw_captured_trays(gs)
+            update_rects += [TRAY_RECT_TOP, TRAY_RECT_BOTTOM]
+            if banners_dirty:
+                draw_banners(gs)
+                update_rects += [BANNER_RECT_TOP, BANNER_RECT_BOTTOM]
+            pygame.display.update(update_rects)
+            board_dirty = False
+            banners_dirty = False
+            clock.tick(ACTIVE_FPS)
+
+# -------------------- Profiling harness --------------------
+def run_profile(frames=600):
+    """Render a fixed number of full frames under cProfile and dump stats.
+
+    The hot path of this app is drawing (fills/blits/flip), not chess logic;
+    this harness exists so that claim can be re-checked before sinking effort
+    into further micro-optimization.
+    """
+    import cProfile, pstats
+
+    def render():
+        for _ in range(frames):
+            screen.blit(STATIC_BG, (0, 0))
+            piece_map = gs.board.piece_map()
+            draw_side(gs, LEFT_ANCHOR, flipped=False, piece_map=piece_map)
+            draw_side(gs, RIGHT_ANCHOR, flipped=True, piece_map=piece_map)
+            draw_banners(gs)
+            draw_captured_trays(gs)
+            pygame.display.flip()
+
+    prof = cProfile.Profile()
+    prof.runcall(render)
+    pstats.Stats(prof).sort_stats("cumulative").print_stats(25)
 
 if __name__ == "__main__":
     db_init()
-    main()
+    if "--profile" in sys.argv:
+        run_profile()
+    else:
+        main()